@@ -4,6 +4,8 @@ Import Safe In Cloud XMLs into 1Password via `op item create`.
 
 - Creates one 1Password item per <card>.
 - Decodes each <image> tag (base64) into a file and attaches it to the item.
+- Uses lxml for parsing and pybase64 for decoding when installed, falling back to
+  the standard library otherwise.
 
 Requires:
   - 1Password CLI (`op`) installed and authenticated.
@@ -16,11 +18,39 @@ import base64
 import binascii
 import os
 import re
+import shutil
+import string
 import subprocess
 import sys
 import tempfile
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
 from pathlib import Path
-import xml.etree.ElementTree as ET
+from typing import Iterable, Iterator
+
+try:
+    # pybase64 wraps libbase64's SIMD (SSSE3/AVX2/NEON) codecs; a drop-in for base64.
+    import pybase64 as b64lib
+except ImportError:
+    b64lib = base64
+
+try:
+    # lxml's C parser is much faster than the pure-Python tree builder on large
+    # exports (inline base64 images easily make these multi-MB).
+    from lxml import etree as ET
+    HAVE_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAVE_LXML = False
+
+_print_lock = threading.Lock()
+
+def log(*args) -> None:
+    """print() that is safe to call from the worker threads."""
+    with _print_lock:
+        print(*args, flush=True)
+
+_PIN_RE = re.compile(r"(?:^|[^a-z0-9])pin(?:[^a-z0-9]|$)")
 
 def custom_field_type_for(name: str) -> str:
     n = (name or "").strip().lower()
@@ -28,7 +58,11 @@ def custom_field_type_for(name: str) -> str:
     if "email" in n:
         return "email"
 
-    if ("password" in n) or re.search(r"(^|[^a-z0-9])pin([^a-z0-9]|$)", n) or ("secret" in n):
+    if ("password" in n) or ("secret" in n):
+        return "password"
+
+    # Cheap substring test first; the regex only runs for names that contain "pin"
+    if ("pin" in n) and _PIN_RE.search(n):
         return "password"
 
     if ("website" in n):
@@ -39,13 +73,31 @@ def custom_field_type_for(name: str) -> str:
 def is_blank(s: str | None) -> bool:
     return s is None or str(s).strip() == ""
 
+_ESCAPE_TABLE = str.maketrans({"\\": "\\\\", ".": "\\.", "=": "\\="})
+
 def escape_assignment_name(s: str) -> str:
     # 1Password CLI assignment statements require escaping periods, equal signs, and backslashes in names.
     # (Value must NOT be escaped.)
-    return s.replace("\\", "\\\\").replace(".", "\\.").replace("=", "\\=")
+    return s.translate(_ESCAPE_TABLE)
+
+_UNSAFE_RE = re.compile(r"[^\w.\-]+")
+_UNSAFE_RUN_RE = re.compile("\0+")
+# ASCII characters outside [A-Za-z0-9_.-] map to a NUL marker so runs can still be
+# collapsed to a single "_" (NUL itself is unsafe, so it can't be confused with input)
+_UNSAFE_ASCII_TABLE = str.maketrans({
+    c: "\0" for c in map(chr, range(128))
+    if c not in string.ascii_letters + string.digits + "_.-"
+})
 
 def safe_filename(s: str, max_len: int = 80) -> str:
-    s = re.sub(r"[^\w.\-]+", "_", s.strip())
+    s = s.strip()
+    if s.isascii():
+        s = s.translate(_UNSAFE_ASCII_TABLE)
+        if "\0" in s:
+            s = _UNSAFE_RUN_RE.sub("_", s)
+    else:
+        # \w also keeps non-ASCII letters and digits
+        s = _UNSAFE_RE.sub("_", s)
     return (s[:max_len] or "attachment")
 
 def guess_extension(data: bytes) -> str:
@@ -59,14 +111,143 @@ def guess_extension(data: bytes) -> str:
         return ".pdf"
     return ".png"
 
+def iter_records(path: Path) -> Iterator[ET.Element]:
+    """
+    Stream the top-level elements (<label>, <card>, ...) of the export one at a time.
+
+    Each element is cleared and detached once the caller moves on to the next one,
+    so memory stays bounded by the largest single card rather than the whole file.
+    """
+    if HAVE_LXML:
+        # huge_tree: base64 text nodes can exceed libxml2's default 10 MB limit.
+        # End events are enough: lxml elements know their parent.
+        context = ET.iterparse(str(path), events=("end",),
+                               huge_tree=True, resolve_entities=False)
+        for _, elem in context:
+            parent = elem.getparent()
+            # Only direct children of the root are records
+            if parent is None or parent.getparent() is not None:
+                continue
+
+            yield elem
+
+            elem.clear()
+            # Drop already-processed siblings so the root doesn't keep them alive
+            while elem.getprevious() is not None:
+                del parent[0]
+        return
+
+    # ElementTree elements don't know their parent, so the depth is tracked from
+    # start events instead (the first one also hands us the root)
+    context = ET.iterparse(str(path), events=("start", "end"))
+    root = None
+    depth = 0
+    for event, elem in context:
+        if event == "start":
+            if root is None:
+                root = elem
+            depth += 1
+            continue
+
+        depth -= 1
+        if depth != 1:
+            continue
+
+        yield elem
+
+        elem.clear()
+        # Drop already-processed siblings so the root doesn't keep them alive
+        del root[:-1]
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_LEADING_WS_RE = re.compile(r"\s*")
+_NON_BASE64_RE = re.compile(r"[^A-Za-z0-9+/]+")
+
+# Base64 characters decoded per step when streaming an attachment to disk
+# (a multiple of 4, so every chunk but the last is a whole number of quanta).
+DECODE_CHUNK_CHARS = 64 * 1024
+
+def compact_base64(b64: str) -> str:
+    """Strip whitespace (e.g. line wrapping) from a base64 payload."""
+    # Inline exports are usually unwrapped; only pay for a stripped copy when needed
+    return _WHITESPACE_RE.sub("", b64) if _WHITESPACE_RE.search(b64) else b64
+
+def base64_head(b64: str, n: int = 16) -> str:
+    """
+    Return the first n base64 alphabet characters of b64, without copying the whole payload.
+
+    Characters outside the alphabet are skipped, as the lenient decoder does, so the
+    result decodes to the same leading bytes as the full payload (stray "=" aside).
+    """
+    # Skip the element's leading indentation first
+    start = _LEADING_WS_RE.match(b64).end()
+    window = 4 * n
+    while True:
+        head = _NON_BASE64_RE.sub("", b64[start:start + window])
+        if len(head) >= n or start + window >= len(b64):
+            break
+        window *= 2
+    head = head[:n]
+    if len(head) % 4 == 1:
+        # A lone trailing character carries no whole byte and can't be decoded
+        head = head[:-1]
+    return head
+
+def iter_decoded_base64(b64_compact: str, chunk_chars: int = DECODE_CHUNK_CHARS) -> Iterator[bytes]:
+    """
+    Decode a whitespace-free base64 payload piece by piece, with fallback for non-strict padding.
+
+    For a strictly valid payload each yielded chunk is at most chunk_chars * 3 / 4 bytes
+    and is dropped once written, so attachments reuse the same small allocations. That
+    bound doesn't hold once the lenient fallback kicks in: it decodes (and copies) all
+    of the remaining payload in one piece.
+
+    The result matches decoding the whole payload at once, including where the
+    lenient fallback stops at padding:
+
+    >>> b"".join(iter_decoded_base64("QUJDRA", chunk_chars=4))
+    b'ABCD'
+    >>> b"".join(iter_decoded_base64("QUJDQQ==QUJD", chunk_chars=4))
+    b'ABCA'
+    >>> b"".join(iter_decoded_base64("QUJDQQ==QUJDR", chunk_chars=4))
+    b'ABCA'
+    """
+    for start in range(0, len(b64_compact), chunk_chars):
+        end = start + chunk_chars
+        chunk = b64_compact[start:end]
+        try:
+            if end < len(b64_compact) and "=" in chunk:
+                # Padding before the last chunk ends the data as far as the lenient
+                # decoder is concerned, which a strict per-chunk decode would miss
+                raise binascii.Error("padding before the end of the payload")
+            yield b64lib.b64decode(chunk, validate=True)
+        except binascii.Error:
+            # Fallback: some exports aren't strictly padded/validated
+            # (stdlib here: its lenient mode is what tolerates the surplus padding).
+            # Decode everything that's left in one go so characters dropped by the
+            # lenient decoder can't shift the remaining chunk boundaries.
+            yield base64.b64decode(b64_compact[start:] + "===")
+            return
+
 def decode_base64_payload(b64: str) -> bytes:
     """Decode base64 payload with fallback for non-strict padding."""
-    b64_compact = "".join(b64.split())
+    return b"".join(iter_decoded_base64(compact_base64(b64)))
+
+def write_file(path: Path, chunks: Iterable) -> None:
+    """
+    Write chunks (bytes-like objects) to path with unbuffered os.write calls.
+
+    Skips the buffered file layer and its extra copy of large payloads; the file is
+    created owner-only since attachments come out of a password vault.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
     try:
-        return base64.b64decode(b64_compact, validate=True)
-    except binascii.Error:
-        # Fallback: some exports aren't strictly padded/validated
-        return base64.b64decode(b64_compact + "===")
+        for chunk in chunks:
+            view = memoryview(chunk)
+            while view:
+                view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
 def process_attachment(
     attachments_dir: Path,
@@ -75,41 +256,50 @@ def process_attachment(
     filename: str | None = None,
     auto_detect_ext: bool = False,
     prefix: str = "",
-    index: int = 1
+    index: int = 1,
+    dry_run: bool = False
 ) -> bool:
     """
     Decode base64 from element, save to file, and create assignment.
 
+    With dry_run the assignment is created but nothing is decoded or written.
+
     Returns True if successful, False if element had no base64 content.
     """
-    b64 = (element.text or "").strip()
-    if not b64:
+    # Not stripped here: compact_base64 drops the surrounding whitespace along with
+    # any line wrapping, so large payloads are copied at most once
+    b64 = element.text or ""
+    if not b64 or b64.isspace():
         return False
 
-    data = decode_base64_payload(b64)
-
     # Determine output filename
     if filename:
         # Use provided filename, sanitize it
         safe_name = safe_filename(filename)
     else:
         # Generate filename with extension detection
-        ext = guess_extension(data) if auto_detect_ext else ""
+        # The magic bytes only need the first 16 characters (12 decoded bytes)
+        ext = guess_extension(decode_base64_payload(base64_head(b64))) if auto_detect_ext else ""
         base = safe_filename(f"{prefix}_{index}")
         safe_name = f"{base}{ext}"
 
     out_path = attachments_dir / safe_name
-    out_path.write_bytes(data)
+    if not dry_run:
+        attachments_dir.mkdir(exist_ok=True)
+        # Stream the decode straight to disk; a strictly valid payload is never held in
+        # memory in full (the lenient fallback decodes whatever is left in one go)
+        write_file(out_path, iter_decoded_base64(compact_base64(b64)))
 
     attach_name = escape_assignment_name(safe_name)
-    assignments.append(f"{attach_name}[file]={str(out_path)}")
+    assignments.append(f"{attach_name}[file]={out_path}")
 
     return True
 
 
 def run_op_create_item(vault: str | None, category: str, title: str, url: str | None,
-                       tags: list[str], assignments: list[str], dry_run: bool) -> None:
-    cmd = ["op", "item", "create", "--category", category, "--title", title]
+                       tags: list[str], assignments: list[str], dry_run: bool,
+                       op_path: str = "op") -> None:
+    cmd = [op_path, "item", "create", "--category", category, "--title", title]
 
     if vault:
         cmd += ["--vault", vault]
@@ -121,18 +311,145 @@ def run_op_create_item(vault: str | None, category: str, title: str, url: str |
     cmd += assignments
 
     if dry_run:
-        print("DRY RUN:", " ".join(cmd))
+        # Written piecewise rather than joined: notes and fields can make cmd large
+        with _print_lock:
+            write = sys.stdout.write
+            write("DRY RUN:")
+            for part in cmd:
+                write(" ")
+                write(part)
+            write("\n")
+            sys.stdout.flush()
         return
 
+    # `op item create` takes exactly one item per invocation (file attachments are only
+    # supported as assignment statements), so there is no batch mode to stream into.
     # Note: assignment statements include secrets on the command line.
-    res = subprocess.run(cmd, text=True, capture_output=True)
+    # Output is kept as bytes; it's only decoded to build an error message.
+    res = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
     if res.returncode != 0:
+        stdout = res.stdout.decode(errors="replace")
+        stderr = res.stderr.decode(errors="replace")
         raise RuntimeError(
-            f"op item create failed for '{title}'.\nSTDOUT:\n{res.stdout}\nSTDERR:\n{res.stderr}"
+            f"op item create failed for '{title}'.\nSTDOUT:\n{stdout}\nSTDERR:\n{stderr}"
         )
     # CLI output varies; printing stdout helps with debugging / getting item IDs.
-    if res.stdout.strip():
-        print(res.stdout.strip())
+    out = res.stdout.strip()
+    if out:
+        with _print_lock:
+            sys.stdout.buffer.write(out + b"\n")
+            sys.stdout.flush()
+
+
+def process_card(card: ET.Element, title: str, groups: dict[str, str], card_dir: Path,
+                 tag_groups: bool, dry_run: bool = False) -> tuple[str | None, list[str], list[str]]:
+    """
+    Build the op arguments for one card and write its attachments into card_dir
+    (unless dry_run).
+
+    Returns (url, tags, assignments).
+    """
+    # One pass over the card's children instead of an ElementPath walk per lookup
+    fields = []
+    key_fields = {}
+    notes = None
+    group_id = None
+    # Collect ALL <image> tags (not just one)
+    images = []
+    # Collect ALL <file> tags with base64 payloads
+    files = []
+    for child in card:
+        if child.tag == "field":
+            fields.append(child)
+            field_type = child.get("type")
+            if field_type in ("login", "password", "website") and field_type not in key_fields:
+                key_fields[field_type] = child
+        elif child.tag == "notes":
+            if notes is None:
+                notes = child
+        elif child.tag == "label_id":
+            if group_id is None:
+                group_id = child
+        elif child.tag == "image":
+            images.append(child)
+        elif child.tag == "file":
+            files.append(child)
+
+    login = key_fields.get("login")
+    password = key_fields.get("password")
+    website = key_fields.get("website")
+
+    # Build op assignment statements
+    assignments: list[str] = []
+
+    if login is not None and login.text:
+        assignments.append(f"username={login.text}")
+        fields.remove(login)
+
+    if password is not None and password.text:
+        assignments.append(f"password={password.text}")
+        fields.remove(password)
+
+    if notes is not None and notes.text:
+        # notesPlain is the built-in notes field for templates/assignments on many item types
+        assignments.append(f"notesPlain={notes.text}")
+
+    url_value = website.text.strip() if (website is not None and website.text) else None
+    if website is not None:
+        fields.remove(website)
+
+    # Template cards are tagged and have their empty fields filled with "-"
+    tags: list[str] = []
+    is_template = card.get("template") == "true"
+    if is_template:
+        tags.append("Templates")
+
+    # Remaining <field> entries become custom text fields
+    for field in fields:
+        name = field.attrib.get("name", "").strip()
+        if not name:
+            continue
+        value = field.text or ""
+        if is_blank(value) and not is_template:
+            continue
+        # Prefix to avoid collisions like the original script did
+        escaped_label = escape_assignment_name("S:" + name)
+        if is_blank(value):
+            assignments.append(f"{escaped_label}[text]=-")
+        else:
+            field_type = custom_field_type_for(name)
+            assignments.append(f"{escaped_label}[{field_type}]={value}")
+
+    # Optionally map group/label to a tag
+    if tag_groups and group_id is not None and group_id.text in groups:
+        gname = (groups.get(group_id.text) or "").strip()
+        if gname:
+            tags.append(gname)
+
+    # Decode & attach each image (auto-detect format)
+    for idx, img in enumerate(images, start=1):
+        process_attachment(
+            attachments_dir=card_dir,
+            element=img,
+            assignments=assignments,
+            auto_detect_ext=True,
+            prefix=title,
+            index=idx,
+            dry_run=dry_run
+        )
+
+    # Decode & attach each file (use provided filename)
+    for idx, file_elem in enumerate(files, start=1):
+        filename = file_elem.attrib.get("name", "").strip() or f"file_{idx}"
+        process_attachment(
+            attachments_dir=card_dir,
+            element=file_elem,
+            assignments=assignments,
+            filename=filename,
+            dry_run=dry_run
+        )
+
+    return url_value, tags, assignments
 
 
 def main() -> int:
@@ -145,18 +462,25 @@ def main() -> int:
     ap.add_argument("--tag-groups", action="store_true",
                     help="If set, map the XML Group name to a 1Password tag")
     ap.add_argument("--dry-run", action="store_true", help="Print op commands; don't create items")
+    ap.add_argument("--jobs", type=int, default=8,
+                    help="Number of items to create concurrently (default: 8)")
     args = ap.parse_args()
+    if args.jobs < 1:
+        ap.error("--jobs must be at least 1")
+
+    # Resolve `op` once rather than having every exec search PATH; also fails fast
+    # before any attachments are decoded.
+    op_path = "op"
+    if not args.dry_run:
+        op_path = shutil.which("op")
+        if op_path is None:
+            print("1Password CLI (`op`) not found on PATH", file=sys.stderr)
+            return 1
 
     input_path = Path(args.input_xml)
-    root = ET.parse(input_path).getroot()
-
-    # Remove deleted cards
-    for card in root.findall("./card[@deleted='true']"):
-        root.remove(card)
-        print("Removed:", card.attrib.get("title", "<no title>"))
 
-    # Groups (labels)
-    groups = {label.attrib["id"]: label.attrib.get("name", "") for label in root.findall("./label")}
+    # Groups (labels); SafeInCloud writes these ahead of the cards
+    groups: dict[str, str] = {}
 
     # Attachment output location
     temp_dir_ctx = None
@@ -168,113 +492,70 @@ def main() -> int:
         attachments_dir = Path(temp_dir_ctx.name)
 
     try:
-        for card in root.findall("./card"):
-            # Skip template cards
-            if card.get("template") == "true":
-                title = (card.attrib.get("title") or "Untitled").strip()
-                print("Skipping template card:", title)
-                continue
-
-            title = card.attrib.get("title", "").strip() or "Untitled"
-            print("Importing card:", title)
+        seq = 0
+        pending: set[Future] = set()
+        with ThreadPoolExecutor(max_workers=args.jobs) as ex:
+            for record in iter_records(input_path):
+                if record.tag == "label":
+                    groups[record.attrib["id"]] = record.attrib.get("name", "")
+                    continue
 
-            login = card.find("./field[@type='login']")
-            password = card.find("./field[@type='password']")
-            website = card.find("./field[@type='website']")
-            notes = card.find("./notes")
-            group_id = card.find("./label_id")
+                if record.tag != "card":
+                    continue
 
-            # Collect ALL <image> tags (not just one)
-            images = card.findall("./image")
+                card = record
 
-            # Collect ALL <file> tags with base64 payloads
-            files = card.findall("./file")
+                # Skip deleted cards
+                if card.get("deleted") == "true":
+                    log("Removed:", card.attrib.get("title", "<no title>"))
+                    continue
 
-            # Build op assignment statements
-            assignments: list[str] = []
+                # Skip template cards
+                if card.get("template") == "true":
+                    title = (card.attrib.get("title") or "Untitled").strip()
+                    log("Skipping template card:", title)
+                    continue
 
-            if login is not None and login.text:
-                assignments.append(f"username={login.text}")
-                card.remove(login)
+                title = card.attrib.get("title", "").strip() or "Untitled"
+                log("Importing card:", title)
 
-            if password is not None and password.text:
-                assignments.append(f"password={password.text}")
-                card.remove(password)
+                # Each card gets its own directory so attachments of cards still being
+                # uploaded can't be overwritten by a later card with the same names.
+                seq += 1
+                card_dir = attachments_dir / f"{seq:05d}_{safe_filename(title)}"
 
-            if notes is not None and notes.text:
-                # notesPlain is the built-in notes field for templates/assignments on many item types
-                assignments.append(f"notesPlain={notes.text}")
+                url_value, tags, assignments = process_card(
+                    card, title, groups, card_dir, args.tag_groups, args.dry_run
+                )
 
-            url_value = website.text.strip() if (website is not None and website.text) else None
-            if website is not None:
-                card.remove(website)
+                item = dict(
+                    vault=args.vault,
+                    category=args.category,
+                    title=title,
+                    url=url_value,
+                    tags=tags,
+                    assignments=assignments,
+                    dry_run=args.dry_run,
+                    op_path=op_path,
+                )
 
-            # Remaining <field> entries become custom text fields
-            for field in card.findall("./field"):
-                name = field.attrib.get("name", "").strip()
-                value = field.text or ""
-                if not name or is_blank(value):
+                if args.dry_run:
+                    # Nothing to wait on; keep the output in card order
+                    run_op_create_item(**item)
                     continue
-                # Prefix to avoid collisions like the original script did
-                label = "S:" + name
-                escaped_label = escape_assignment_name(label)
-                field_type = custom_field_type_for(name)
-                assignments.append(f"{escaped_label}[{field_type}]={value}")
-
-            # Template cards: tag them and fill empty fields with "-"
-            tags: list[str] = []
-            if card.get("template") == "true":
-                tags.append("Templates")
-                for field in card.findall("./field"):
-                    name = field.attrib.get("name", "").strip()
-                    if not name:
-                        continue
-                    label = "S:" + name
-                    escaped_label = escape_assignment_name(label)
-                    assignments.append(f"{escaped_label}[text]=-")
-
-            # Optionally map group/label to a tag
-            if args.tag_groups and group_id is not None and group_id.text in groups:
-                gname = (groups.get(group_id.text) or "").strip()
-                if gname:
-                    tags.append(gname)
-
-            # Decode & attach each image (auto-detect format)
-            for idx, img in enumerate(images, start=1):
-                if process_attachment(
-                    attachments_dir=attachments_dir,
-                    element=img,
-                    assignments=assignments,
-                    auto_detect_ext=True,
-                    prefix=title,
-                    index=idx
-                ):
-                    # Remove the tag to avoid duplicating base64 into text fields
-                    card.remove(img)
-
-            # Decode & attach each file (use provided filename)
-            for idx, file_elem in enumerate(files, start=1):
-                filename = file_elem.attrib.get("name", "").strip() or f"file_{idx}"
-                if process_attachment(
-                    attachments_dir=attachments_dir,
-                    element=file_elem,
-                    assignments=assignments,
-                    filename=filename
-                ):
-                    # Remove the tag to avoid duplicating base64 into text fields
-                    card.remove(file_elem)
-
-            run_op_create_item(
-                vault=args.vault,
-                category=args.category,
-                title=title,
-                url=url_value,
-                tags=tags,
-                assignments=assignments,
-                dry_run=args.dry_run,
-            )
-
-        print("Complete")
+
+                # Bound the number of queued items so memory doesn't grow with the export
+                if len(pending) >= args.jobs * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        fut.result()
+
+                pending.add(ex.submit(run_op_create_item, **item))
+
+            for fut in as_completed(pending):
+                fut.result()
+
+        log("Complete")
         return 0
     finally:
         if temp_dir_ctx is not None: